@@ -1,5 +1,9 @@
+import gc
 import unittest
 import logging
+import sys
+import tracemalloc
+import weakref
 
 from z_notifier import LoggerSlackFormatter
 
@@ -34,6 +38,10 @@ class ExtendedException(Exception):
         return self.msg
 
 
+class LargeException(Exception):
+    pass
+
+
 class LoggingFormatterTestCase(unittest.TestCase):
     def setUp(self) -> None:
         self.webhook_url = 'https://hooks.slack.com/services/some-channel-id'
@@ -107,3 +115,75 @@ class LoggingFormatterTestCase(unittest.TestCase):
         self.assertEqual(payload['attachments'][1]['pretext'], 'Some pretext')
         self.assertEqual(payload['attachments'][0]['title'], 'Something happened')
         self.assertEqual(payload['attachments'][1]['title'], 'Something else happened')
+
+
+class LoggingFormatterSnapshotTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.webhook_url = 'https://hooks.slack.com/services/some-channel-id'
+        self.formatter = LoggerSlackFormatter(webhook_url=self.webhook_url, max_length=100, config={
+            'header': '__exception_msg__',
+            'footer': '__exception_class__',
+        })
+
+    @staticmethod
+    def create_log_record():
+        """Return a record whose exception traceback holds a frame with large locals"""
+        def fail():
+            large_local = bytearray(256 * 1024)  # noqa: F841
+            raise LargeException('Something happened ' + 'x' * 1000)
+
+        try:
+            fail()
+        except LargeException as e:
+            return logging.LogRecord(name='error',
+                                     level=logging.ERROR,
+                                     pathname=__file__,
+                                     lineno=0,
+                                     msg=e,
+                                     args=None,
+                                     exc_info=sys.exc_info())
+
+    def test_snapshot_is_formatted_as_record(self):
+        """Test that formatting a snapshot returns the same payload as formatting the record itself"""
+        log_record = self.create_log_record()
+        snapshot = self.formatter.snapshot(log_record)
+
+        self.assertDictEqual(self.formatter.format(snapshot), self.formatter.format(log_record))
+        self.assertEqual(self.formatter.format(snapshot)['footer'], 'LargeException')
+
+    def test_snapshot_caps_strings(self):
+        """Test that strings longer than max_length are truncated"""
+        snapshot = self.formatter.snapshot(self.create_log_record())
+
+        self.assertEqual(len(snapshot.header), 100)
+        self.assertTrue(snapshot.header.startswith('Something happened x'))
+        self.assertEqual(len(snapshot.attachments[0].title), 100)
+        self.assertEqual(len(snapshot.attachments[0].text), 100)
+        self.assertEqual(snapshot.attachments[0].pretext, 'ERROR')
+
+    def test_snapshot_releases_exception(self):
+        """Test that a snapshot doesn't keep the exception, its traceback or its frames alive"""
+        log_record = self.create_log_record()
+        exception_ref = weakref.ref(log_record.msg)
+        snapshot = self.formatter.snapshot(log_record)
+        del log_record
+        gc.collect()
+
+        self.assertIsNone(exception_ref())
+        self.assertFalse(hasattr(snapshot, '__dict__'))
+
+    def test_snapshot_memory_is_bounded(self):
+        """Test that queued snapshots retain a bounded amount of memory per alert"""
+        alerts = 50
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            queue = [self.formatter.snapshot(self.create_log_record()) for _ in range(alerts)]
+            gc.collect()
+            after, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(len(queue), alerts)
+        self.assertLess((after - before) / alerts, 4 * 1024)
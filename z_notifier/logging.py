@@ -2,33 +2,119 @@ import logging
 from z_notifier.slack import SlackNotifier, SlackMessage
 
 
+SNAPSHOT_MAX_LENGTH = 3000
+
+
+class SlackAttachmentSnapshot:
+    """Compact copy of the fields needed to render one slack message attachment"""
+    __slots__ = ('pretext', 'title', 'text', 'color')
+
+    def __init__(self, pretext, title, text, color):
+        self.pretext = pretext
+        self.title = title
+        self.text = text
+        self.color = color
+
+
+class SlackRecordSnapshot:
+    """
+    Compact copy of a log record holding only what LoggerSlackFormatter needs to build a payload.
+    It keeps no reference to the record, its exception, the traceback or the traceback's frames,
+    so it can be held until the message is actually delivered.
+    """
+    __slots__ = ('header', 'footer', 'attachments')
+
+    def __init__(self, header, footer, attachments):
+        self.header = header
+        self.footer = footer
+        self.attachments = attachments
+
+
 class LoggerSlackHandler(logging.Handler):
     def emit(self, record):
-        data = self.mapLogRecord(record)
+        data = self.mapLogRecord(self.prepare(record))
         message = SlackMessage.from_dict(data)
         SlackNotifier.send_message(message=message)
 
+    def prepare(self, record):
+        """
+        Return a snapshot of the record which is safe to keep until the message is sent.
+        Records are returned as they are if the handler doesn't use a LoggerSlackFormatter.
+        """
+        if isinstance(self.formatter, LoggerSlackFormatter):
+            return self.formatter.snapshot(record)
+
+        return record
+
     def mapLogRecord(self, record):
         payload = self.format(record)
         return payload
 
 
 class LoggerSlackFormatter(logging.Formatter):
-    def __init__(self, fmt=None, datefmt=None, style='%', *, webhook_url=None, config=None):
+    def __init__(self, fmt=None, datefmt=None, style='%', *, webhook_url=None, config=None,
+                 max_length=SNAPSHOT_MAX_LENGTH):
         super().__init__(fmt, datefmt, style)
         assert webhook_url is not None, 'webhook_url must be set'
         self.webhook_url = webhook_url
         self.config = config or {}
+        self.max_length = max_length
 
     def format(self, record):
+        """Return the slack payload of a log record or of a snapshot created by `snapshot`"""
+        if not isinstance(record, SlackRecordSnapshot):
+            record = self.snapshot(record)
+
         return {
             'webhook_url': self.webhook_url,
-            'header': self.get_header(record),
-            'footer': self.get_footer(record),
+            'header': record.header,
+            'footer': record.footer,
             'footer_url': self.get_footer_url(),
-            'attachments': self.get_attachments(record)
+            'attachments': [
+                {
+                    'pretext': a.pretext,
+                    'title': a.title,
+                    'text': a.text,
+                    'color': a.color
+                }
+                for a
+                in record.attachments
+            ]
         }
 
+    def snapshot(self, record):
+        """
+        Return a SlackRecordSnapshot with the fields read from the record,
+        converted to strings and capped to `max_length` characters.
+        """
+        return SlackRecordSnapshot(
+            header=self.compact(self.get_header(record)),
+            footer=self.compact(self.get_footer(record)),
+            attachments=tuple(
+                SlackAttachmentSnapshot(
+                    pretext=self.compact(a['pretext']),
+                    title=self.compact(a['title']),
+                    text=self.compact(SlackMessage.process_text(a['text'])),
+                    color=a['color']
+                )
+                for a
+                in self.get_attachments(record)
+            )
+        )
+
+    def compact(self, value):
+        """Return the value as a string no longer than `max_length`, None is kept as it is"""
+        if value is None:
+            return None
+
+        if type(value) is not str:
+            value = str(value)
+
+        if self.max_length is not None and len(value) > self.max_length:
+            return value[:self.max_length - 1] + '…'
+
+        return value
+
     @staticmethod
     def get_color(levelno):
         """Get colour code based on the severity level of log record"""